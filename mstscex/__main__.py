@@ -1,7 +1,6 @@
 """Entry point for utility."""
 
 import argparse
-import os
 import sys
 
 from . import RdpTemplate
@@ -37,28 +36,23 @@ def main() -> None:
 
     # determine input file
     input_filename = args.templatefile
-    input_file = None
 
     if input_filename == "-":
-        input_file = os.fdopen(sys.stdin.fileno(), "r", closefd=False)
+        input_file = sys.stdin
     else:
         input_file = open(input_filename, "r")
 
     template = RdpTemplate(input_file, args.rest, args.sign)
 
     output_filename = args.output
-    output_file = None
 
     if output_filename == "-":
-        output_file = os.fdopen(sys.stdout.fileno(), "w", closefd=False)
+        template.writeto(sys.stdout.buffer)
     elif output_filename:
-        output_file = open(output_filename, "w")
-
-    if output_file:
-        with output_file:
+        with open(output_filename, "wb") as output_file:
             template.writeto(output_file)
 
-    if not output_file or args.launch:
+    if not output_filename or args.launch:
         template.launch()
 
 
@@ -3,52 +3,81 @@
 from collections.abc import Iterable
 import re
 import subprocess
-from typing import Any, Callable, Generator
+import time
+from typing import Any, Callable
 
 from .util import log
 
 
 def cmd_regex(
-    cmd: str | list[str], regex: bytes, encoding: str = "utf-8"
-) -> Callable[[], Iterable[str]]:
+    cmd: str | list[str],
+    regex: bytes,
+    encoding: str = "utf-8",
+    cache_ttl: float = 5.0,
+    prefilter: bytes | None = None,
+) -> Callable[[], list[str]]:
     """Run a command and get part of output.
 
-    Runs a command, and yield each string matched by a regex from the
-    command's stdout.
+    Runs a command, and return each string matched by a regex from the
+    command's stdout. The result is cached for cache_ttl seconds so
+    repeated calls during one render don't respawn the command. An
+    optional prefilter skips lines without the given substring before
+    the regex runs.
     """
     comp_regex = re.compile(regex, re.IGNORECASE)
 
-    def fn() -> Generator[str, None, None]:
+    cached: list[str] = []
+    cached_at: float | None = None
+
+    def fn() -> list[str]:
+        nonlocal cached, cached_at
+
+        now = time.monotonic()
+
+        if cached_at is not None and now - cached_at < cache_ttl:
+            return cached
+
+        results: list[str] = []
+
         try:
             lines = subprocess.check_output(
                 cmd, creationflags=0x00000008
             ).splitlines()
 
             for line in lines:
+                if prefilter is not None and prefilter not in line:
+                    continue
+
                 if (matches := comp_regex.match(line)) is not None:
-                    yield matches.group(1).decode(encoding).strip()
+                    results.append(matches.group(1).strip().decode(encoding))
         except subprocess.CalledProcessError:
             pass
 
+        cached = results
+        cached_at = now
+
+        return results
+
     return fn
 
 
-get_connected_wifi: Callable[[], Iterable[str]] = cmd_regex(
-    ["netsh", "wlan", "show", "interfaces"], rb"^\s*SSID\s*:\s*(.+?)\s*$"
+get_connected_wifi: Callable[[], list[str]] = cmd_regex(
+    ["netsh", "wlan", "show", "interfaces"],
+    rb"^\s*SSID\s*:(.*)$",
+    prefilter=b"SSID",
 )
-get_connected_vpn: Callable[[], Iterable[str]] = cmd_regex(
-    ["ipconfig"], rb"^\s*(?:PPP)\s+adapter\s+(.+?)\s*:\s*$"
+get_connected_vpn: Callable[[], list[str]] = cmd_regex(
+    ["ipconfig"],
+    rb"^\s*PPP\s+adapter\s+(.*):\s*$",
+    prefilter=b"adapter",
 )
 
 
 def contains(items: Iterable[Any], *args: Any) -> bool:
     """Determine if items contains any of the remaining arguments."""
-    for item in items:
-        for item2 in args:
-            if item2 == item:
-                return True
+    targets = set(args)
 
-    return False
+    return any(item in targets for item in items)
 
 
 def can_ping(host: str) -> bool:
@@ -57,7 +86,7 @@ def can_ping(host: str) -> bool:
 
     result = (
         subprocess.call(
-            ["ping", "-n", "1", host],
+            ["ping", "-n", "1", "-w", "500", host],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
         )
@@ -69,25 +98,78 @@ def can_ping(host: str) -> bool:
     return result
 
 
+def can_ping_any(*hosts: str) -> str | None:
+    """Return the first host that responds to a ping, or None.
+
+    All hosts are pinged in parallel, so the wall time is bounded by the
+    slowest single ping instead of the sum of them.
+    """
+    continue_log = log(
+        "INFO", f"Checking ping to any of {', '.join(hosts)}: ", end=""
+    )
+
+    procs = {
+        host: subprocess.Popen(
+            ["ping", "-n", "1", "-w", "500", host],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        for host in hosts
+    }
+
+    result = None
+
+    try:
+        while procs and result is None:
+            for host, proc in list(procs.items()):
+                code = proc.poll()
+
+                if code is None:
+                    continue
+
+                del procs[host]
+
+                if code == 0:
+                    result = host
+
+                    break
+            else:
+                time.sleep(0.05)
+    finally:
+        # first responder wins; kill the stragglers
+        for proc in procs.values():
+            proc.kill()
+
+    continue_log(result if result is not None else "fail", end=None)
+
+    return result
+
+
 def wifi_is(*opts: str) -> bool:
     """Get whether the user is connected to any SSID."""
-    log("INFO", f"Checking Wi-Fi connection is {', '.join(opts)}")
+    log("INFO", lambda: f"Checking Wi-Fi connection is {', '.join(opts)}")
+
+    connected = get_connected_wifi()
+
     log(
         "INFO",
         lambda: "Connected Wi-Fi:"
-        + "\r\n".join(f"\t{x}" for x in get_connected_wifi()),
+        + "\r\n".join(f"\t{x}" for x in connected),
     )
 
-    return contains(get_connected_wifi(), *opts)
+    return contains(connected, *opts)
 
 
 def vpn_is(*opts: str) -> bool:
     """Get whether the user is connected to any VPN."""
-    log("INFO", f"Checking VPN connection is {', '.join(opts)}")
+    log("INFO", lambda: f"Checking VPN connection is {', '.join(opts)}")
+
+    connected = get_connected_vpn()
+
     log(
         "INFO",
         lambda: "Connected VPN:"
-        + "\r\n".join(f"\t{x}" for x in get_connected_vpn()),
+        + "\r\n".join(f"\t{x}" for x in connected),
     )
 
-    return contains(get_connected_vpn(), *opts)
+    return contains(connected, *opts)
@@ -2,14 +2,59 @@
 
 import os
 import subprocess
-from typing import Any, Callable, TextIO, cast
+from typing import Any, Callable, TextIO
 
 import jinja2
 
 from .bufferedlineiterator import BufferedLineIterator
-from .functions import can_ping, contains, vpn_is, wifi_is
+from .functions import can_ping, can_ping_any, contains, vpn_is, wifi_is
 from .rdpsettings import RdpSettings
-from .util import log
+from .util import can_log, log
+
+
+# the default directory is per-user and permission-checked; entries are
+# checksummed, so one cache is safe to share between environments
+_bytecode_cache = jinja2.FileSystemBytecodeCache()
+
+
+def _create_environment(template_dir: str) -> jinja2.Environment:
+    environment = jinja2.Environment(
+        autoescape=False,
+        loader=jinja2.FileSystemLoader(
+            [template_dir, "./", os.path.dirname(__file__)]
+        ),
+        bytecode_cache=_bytecode_cache,
+    )
+
+    environment.globals.update(
+        **{
+            "contains": contains,
+            "wifi_is": wifi_is,
+            "vpn_is": vpn_is,
+            "can_ping": can_ping,
+            "can_ping_any": can_ping_any,
+        }
+    )
+
+    return environment
+
+
+# one environment per template directory, so same-named templates and
+# relative includes in different directories don't collide in Jinja's
+# name-keyed template cache
+_environments: dict[str, jinja2.Environment] = {}
+
+
+def _get_environment(template_dir: str = "") -> jinja2.Environment:
+    template_dir = os.path.abspath(template_dir or ".")
+
+    environment = _environments.get(template_dir)
+
+    if environment is None:
+        environment = _create_environment(template_dir)
+        _environments[template_dir] = environment
+
+    return environment
 
 
 class RdpBuilder:
@@ -24,7 +69,7 @@ class RdpBuilder:
 
     def __init__(
         self,
-        template: str | TextIO,
+        template: str | TextIO | jinja2.Template,
         template_name: str | None = None,
         pre_sign_hook: Callable[["RdpBuilder", Any], None] | None = None,
     ):
@@ -33,41 +78,38 @@ class RdpBuilder:
 
         self._settings = RdpSettings()
 
-        if not isinstance(template, str):
+        if isinstance(template, jinja2.Template):
+            # pre-compiled template
+            self._environment = template.environment
+            self._template = template
+        elif isinstance(template, str):
             if template_name is None:
-                template_name = template.name
+                template_name = template
 
-            data = template.read()
+            # load via the directory's environment so the template and
+            # bytecode caches are used instead of re-reading the file
+            environment = _get_environment(os.path.dirname(template_name))
+
+            self._environment = environment
+            self._template = environment.get_template(
+                os.path.basename(template_name)
+            )
         else:
+            # TextIO, e.g. stdin
             if template_name is None:
-                template_name = template
+                template_name = template.name
+
+            data = template.read()
+
+            template_dir = ""
+
+            if isinstance(template_name, str):
+                template_dir = os.path.dirname(template_name)
+
+            environment = _get_environment(template_dir)
 
-            with open(template_name, "r") as f:
-                data = f.read()
-
-        loader = jinja2.FileSystemLoader(
-            [
-                os.path.dirname(cast(str, template_name)),
-                "./",
-                os.path.dirname(__file__),
-            ]
-        )
-        environment = jinja2.Environment(autoescape=False, loader=loader)
-
-        environment.globals.update(
-            **{
-                "contains": contains,
-                "wifi_is": wifi_is,
-                "vpn_is": vpn_is,
-                "can_ping": can_ping,
-                "get_setting": self.settings.get,
-                "sign": self._delayed_sign_template,
-            }
-        )
-
-        self._environment = environment
-
-        self._template = environment.from_string(data)
+            self._environment = environment
+            self._template = environment.from_string(data)
 
         self._pre_sign_hook = pre_sign_hook
 
@@ -75,8 +117,15 @@ class RdpBuilder:
         """Use template to generate a file with supplied arguments."""
         line_buffer = BufferedLineIterator()
 
+        # parse completed lines between chunks: get_setting must see
+        # settings the template emitted earlier in the same render.
+        # per-builder helpers go in as render variables so shared
+        # template objects never carry another builder's state
         for part in self.template.generate(
-            argv=args, args=subprocess.list2cmdline(args)
+            argv=args,
+            args=subprocess.list2cmdline(args),
+            get_setting=self.settings.get,
+            sign=self._delayed_sign_template,
         ):
             line_buffer.push(part)
 
@@ -101,8 +150,9 @@ class RdpBuilder:
 
         result = str(self.settings)
 
-        log("DEBUG", "Generated file:")
-        log("DEBUG", result)
+        if can_log("DEBUG"):
+            log("DEBUG", "Generated file:")
+            log("DEBUG", result)
 
         return result
 
@@ -156,7 +206,7 @@ class RdpBuilder:
 
 
 def generate_rdp(
-    template: str | TextIO,
+    template: str | TextIO | jinja2.Template,
     args: Any,
     pre_sign_hook: Callable[[RdpBuilder, Any], None] | None = None,
     sign_with: tuple[str, str] | None = None,
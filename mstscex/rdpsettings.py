@@ -12,6 +12,8 @@ from types import MappingProxyType
 
 from .util import log, x509_sign
 
+_LINESEP = os.linesep
+
 
 class RdpLine:
     """Configuration line for an RDP file."""
@@ -19,6 +21,7 @@ class RdpLine:
     _name: str
     _type: str
     _value: str | int
+    _cached_str: str | None
 
     def __init__(self, name: str, typ: str, val: str | int):
         """Create a configuration line."""
@@ -54,10 +57,14 @@ class RdpLine:
             val = int(val)
 
         self._value = val
+        self._cached_str = None
 
     def __str__(self) -> str:
         """Return the RDP file representation of this config line."""
-        return "%s:%s:%s" % (self.name, self.type, str(self.value))
+        if self._cached_str is None:
+            self._cached_str = f"{self._name}:{self._type}:{self._value}"
+
+        return self._cached_str
 
 
 class RdpSettings:
@@ -125,8 +132,10 @@ class RdpSettings:
         }
     )
 
-    _settings: dict[str, RdpLine]
-    _lines: list[str | RdpLine | None]
+    _SECURE_KEYS = frozenset(SECURE_SETTINGS)
+
+    _settings: dict[str, RdpLine | str]
+    _blank_count: int
 
     def __init__(self) -> None:
         """Create a collection of RDP settings."""
@@ -135,13 +144,15 @@ class RdpSettings:
     def clear(self) -> None:
         """Remove all settings."""
         self._settings = {}
-        self._lines = []
+        self._blank_count = 0
 
     def _add_line(self, raw: str = "") -> None:
         if raw is None:
             raw = ""
 
-        self._lines.append(raw)
+        # placeholder key keeps the blank line in insertion order
+        self._settings[f"__blank_{self._blank_count}__"] = raw
+        self._blank_count += 1
 
     def parse_line(self, orig_line: str | None) -> bool:
         """Add a string as an RDP setting."""
@@ -155,19 +166,18 @@ class RdpSettings:
 
             return True
 
-        try:
-            c_pos = line.index(":")
-            c2_pos = line.index(":", c_pos + 1)
+        name, sep1, rest = line.partition(":")
+        typ, sep2, val = rest.partition(":")
 
-            name = line[:c_pos]
-            typ = line[c_pos + 1 : c2_pos]
-            val = line[c2_pos + 1 :]
+        if sep1 and sep2:
+            try:
+                self.set(name, val, typ)
 
-            self.set(name, val, typ)
+                return True
+            except ValueError:
+                pass
 
-            return True
-        except ValueError:
-            log("WARNING", "Unable to parse line:", line)
+        log("WARNING", "Unable to parse line:", line)
 
         return False
 
@@ -188,22 +198,18 @@ class RdpSettings:
         if typ is None:
             typ = "s"
 
-        is_new = True
+        existing = self._settings.get(name_l)
 
-        if name_l in self._settings:
-            typ = self._settings[name_l].type
-            is_new = False
+        if isinstance(existing, RdpLine):
+            typ = existing.type
 
-        prop = RdpLine(name, typ, val)
+        # dict preserves insertion order, so overwriting keeps position
+        self._settings[name_l] = RdpLine(name, typ, val)
 
-        self._settings[name_l] = prop
-
-        if is_new:
-            self._lines.append(prop)
-
-        # remove signature
+        # remove signature, but only when there is one to invalidate
         if (
-            name_l in self.SECURE_SETTINGS
+            name_l in self._SECURE_KEYS
+            and self.SIGNATURE in self._settings
             and name_l != self.SIGNATURE_SCOPE
             and name_l != self.SIGNATURE
         ):
@@ -216,10 +222,12 @@ class RdpSettings:
 
     def get(self, name: str) -> str | int | None:
         """Get a configuration item."""
-        try:
-            return self._settings[name.lower()].value
-        except KeyError:
-            return None
+        ret = self._settings.get(name.lower())
+
+        if isinstance(ret, RdpLine):
+            return ret.value
+
+        return None
 
     def __getitem__(self, key: str) -> str | int | None:
         """Get a configuration item."""
@@ -231,18 +239,11 @@ class RdpSettings:
 
     def remove(self, key: str) -> None:
         """Remove a configuration item."""
-        # remove setting
         try:
-            del self._settings[key]
+            del self._settings[key.lower()]
         except KeyError:
             pass
 
-        # remove line position
-        try:
-            self._lines.remove(key)
-        except ValueError:
-            pass
-
     def __delitem__(self, key: str) -> None:
         """Remove a configuration item."""
         self.remove(key)
@@ -250,7 +251,7 @@ class RdpSettings:
     @property
     def lines(self) -> Iterable[str]:
         """Get all configuration items as strings."""
-        for line in self._lines:
+        for line in self._settings.values():
             yield str(line)
 
         # end with blank line :)
@@ -262,7 +263,13 @@ class RdpSettings:
 
     def __str__(self) -> str:
         """Get all configuration items as a complete string."""
-        return os.linesep.join(self.lines)
+        # a list lets str.join pre-size the output buffer
+        parts = [str(line) for line in self._settings.values()]
+
+        # end with blank line :)
+        parts.append("")
+
+        return _LINESEP.join(parts)
 
     @property
     def signed(self) -> bool:
@@ -303,8 +310,11 @@ class RdpSettings:
         sign_settings = []
         sign_names = []
 
+        # secure keys are already lowercase, so intersect directly
+        present = self.SECURE_SETTINGS.keys() & self._settings.keys()
+
         for name, secure_name in self.SECURE_SETTINGS.items():
-            if name in self:
+            if name in present:
                 sign_settings.append(self._settings[name])
                 sign_names.append(secure_name)
 
@@ -312,12 +322,10 @@ class RdpSettings:
 
         log("INFO", "Signature scope:", ", ".join(sign_names))
 
-        blob = (
-            "\r\n".join(str(line) for line in sign_settings)
-            + "\r\nsignscope:s:"
-            + scope
-            + "\r\n\0"
-        ).encode("UTF-16LE")
+        segments = [f"{line}\r\n" for line in sign_settings]
+        segments.append(f"signscope:s:{scope}\r\n\0")
+
+        blob = b"".join(s.encode("UTF-16LE") for s in segments)
 
         blob_sig = x509_sign(cert, key, blob)
 
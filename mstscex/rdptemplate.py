@@ -2,16 +2,18 @@
 
 import subprocess
 import time
-from typing import Iterable, TextIO
+from typing import BinaryIO, Iterable, TextIO
 
 from .rdpbuilder import generate_rdp
 from .util import TSPortalNameGenerator, log
 
+_BOM_UTF16LE = b"\xff\xfe"
+
 
 class RdpTemplate:
     """Generator for an RDP file."""
 
-    _rdp_file: str
+    _rdp_bytes: bytes
 
     _name_gen: TSPortalNameGenerator
 
@@ -24,13 +26,17 @@ class RdpTemplate:
         """Create a file generator for an RDP file."""
         self._name_gen = TSPortalNameGenerator()
 
-        self._rdp_file = generate_rdp(
+        # encode once; every write-out reuses the same bytes
+        self._rdp_bytes = generate_rdp(
             template, args, pre_sign_hook=None, sign_with=sign_with
-        )
+        ).encode("utf-16le")
+
+    def writeto(self, file: BinaryIO) -> int:
+        """Write the generated file to a binary IO stream."""
+        count = file.write(_BOM_UTF16LE)
+        count += file.write(self._rdp_bytes)
 
-    def writeto(self, file: TextIO) -> int:
-        """Write the generated file to an IO stream."""
-        return file.write(self._rdp_file)
+        return count
 
     def launch(self, wait: bool = False) -> None:
         """Launch the generated file."""
@@ -40,9 +46,7 @@ class RdpTemplate:
 
             log("INFO", "Generated RDP file:", filename)
 
-            with open(filename, "w", encoding="utf-16le") as f:
-                f.write("\ufeff")
-
+            with open(filename, "wb") as f:
                 self.writeto(f)
 
             log("INFO", "Launching RDP file")
@@ -1,8 +1,8 @@
 """Utility methods."""
 
+import functools
 import os
 import random
-import string
 import sys
 import tempfile
 from types import TracebackType
@@ -10,6 +10,7 @@ from typing import Callable, Literal, Protocol, Self, TextIO, cast
 
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
 from cryptography.hazmat.primitives.serialization import pkcs7
 
 LogLevelStr = Literal[
@@ -36,7 +37,13 @@ class SimpleLogger:
         "CRITICAL": 600,
     }
 
+    # level names ordered by value, for int -> name lookups
+    _LEVEL_NAMES: tuple[tuple[LogLevelStr, int], ...] = tuple(
+        sorted(LOG_LEVELS.items(), key=lambda x: x[1])
+    )
+
     _level: LogLevel
+    _level_int: int
 
     def __init__(self, level: LogLevel = "DEBUG"):
         """Create a simple logger."""
@@ -52,17 +59,17 @@ class SimpleLogger:
         """Set the current logging level."""
         self._level = val
 
+        if not isinstance(val, int):
+            val = self.LOG_LEVELS[val]
+
+        self._level_int = val
+
     def can_log(self, level: LogLevel) -> bool:
         """Return whether the log level is at or above min_level."""
-        if not isinstance(self.level, int):
-            int_val = self.LOG_LEVELS[self.level]
-        else:
-            int_val = self.level
-
         if not isinstance(level, int):
             level = self.LOG_LEVELS[level]
 
-        return level >= int_val
+        return level >= self._level_int
 
     def _no_log(
         self, *values: object, end: str | None = "\n"
@@ -90,9 +97,7 @@ class SimpleLogger:
         if isinstance(level, str):
             level_str = level.upper()
         else:
-            for level_name, level_val in sorted(
-                self.LOG_LEVELS.items(), key=lambda x: x[1]
-            ):
+            for level_name, level_val in self._LEVEL_NAMES:
                 if level_val < level:
                     level_str = level_name
 
@@ -124,6 +129,7 @@ class SimpleLogger:
 _logger = SimpleLogger()
 
 log = _logger.log
+can_log = _logger.can_log
 
 
 class TSPortalNameGenerator:
@@ -134,7 +140,7 @@ class TSPortalNameGenerator:
 
     def __init__(self) -> None:
         """Create the name generator."""
-        rand_digits = "".join(random.choice(string.digits) for i in range(5))
+        rand_digits = f"{random.randrange(100000):05d}"
 
         self._prefix = os.path.join(
             tempfile.gettempdir(), f"TSPORTAL#{rand_digits}"
@@ -188,6 +194,16 @@ class TSPortalNameGenerator:
         return False
 
 
+@functools.lru_cache(maxsize=8)
+def _load_cert_key(
+    cert_raw: bytes, key_raw: bytes
+) -> tuple[x509.Certificate, PrivateKeyTypes]:
+    cert = x509.load_pem_x509_certificate(cert_raw)
+    key = serialization.load_pem_private_key(key_raw, None)
+
+    return cert, key
+
+
 def x509_sign(
     cert_raw: bytes,
     key_raw: bytes,
@@ -195,12 +211,12 @@ def x509_sign(
     get_pw_fn: Callable[[], str] | None = None,
 ) -> bytes:
     """Sign data with a key using X509 public-key crypto."""
-    cert = x509.load_pem_x509_certificate(cert_raw)
-
     try:
-        key = serialization.load_pem_private_key(key_raw, None)
+        cert, key = _load_cert_key(cert_raw, key_raw)
     except ValueError:
         if get_pw_fn is not None:
+            # encrypted keys bypass the cache
+            cert = x509.load_pem_x509_certificate(cert_raw)
             key = serialization.load_pem_private_key(key_raw, get_pw_fn())
         else:
             raise